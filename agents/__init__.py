@@ -8,6 +8,13 @@ This package contains:
 - supervisor.py: Main routing supervisor
 """
 
-from .supervisor import supervisor_graph, run_supervisor
+from .supervisor import get_supervisor_graph, run_supervisor, run_supervisor_batch
 
-__all__ = ["supervisor_graph", "run_supervisor"]
+__all__ = ["supervisor_graph", "get_supervisor_graph", "run_supervisor", "run_supervisor_batch"]
+
+
+def __getattr__(name: str):
+    """Resolve `supervisor_graph` lazily so importing the package doesn't compile it."""
+    if name == "supervisor_graph":
+        return get_supervisor_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,6 +11,16 @@ from langchain_core.tools import tool
 # Path to your ChromaDB logic
 CHROMA_DIR = "vectorstore/chroma"
 
+# HNSW parameters used if the collection doesn't exist yet (same as ingestion);
+# search_ef is kept low for query latency on a well-built graph. An existing
+# collection keeps the parameters it was created with until ingestion rebuilds it.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 32
+}
+
 # Embedding model (singleton/lazy load)
 _embedding_model = None
 _vectordb = None
@@ -31,7 +41,8 @@ def get_embedding_model():
             _embedding_model = FakeEmbeddings(size=384)
     return _embedding_model
 
-def _get_vectordb():
+def get_vectordb():
+    """Returns the persistent Chroma handle (loaded once per process)."""
     global _vectordb
     if _vectordb is None:
         try:
@@ -40,7 +51,8 @@ def _get_vectordb():
             # Load ChromaDB (persistent)
             _vectordb = Chroma(
                 persist_directory=CHROMA_DIR,
-                embedding_function=embeddings
+                embedding_function=embeddings,
+                collection_metadata=HNSW_METADATA
             )
         except Exception as e:
             print(f"Error initializing ChromaDB: {e}")
@@ -63,7 +75,7 @@ def template_retriever_tool(role_type: str, context: Optional[str] = None) -> di
             "templates": list of matching templates
         }
     """
-    db = _get_vectordb()
+    db = get_vectordb()
     if db is None:
         return {"success": False, "error": "Database not initialized"}
     
@@ -11,7 +11,7 @@ from langgraph.graph import StateGraph, END
 from langchain_core.messages import AIMessage, HumanMessage
 
 from agents.shared.state import AgentState
-from agents.shared.utils import logger, extract_last_message
+from agents.shared.utils import logger, extract_last_message, load_cv_text
 
 # Import tools from the tools folder
 # Ensure you have updated __init__.py in tools folder to export these
@@ -72,7 +72,7 @@ def agent_node(state: AgentState) -> dict:
     job_context = state.get("job_context", {})
     
     # Check if we have a CV to analyze
-    cv_text = job_context.get("current_cv_text")
+    cv_text = load_cv_text(job_context)
     
     response_content = ""
     
@@ -4,9 +4,12 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from langchain_core.tools import tool
 
+from agents.shared.utils import normalize_skill
+
+
 def _normalize_skill(s: str) -> str:
-    """Normalise une compétence pour comparaison (lower + strip)."""
-    return (s or "").strip().lower()
+    """Normalise une compétence pour comparaison (lower + strip + séparateurs)."""
+    return normalize_skill(s or "")
 
 
 def analyze_candidate_match(
@@ -22,20 +25,14 @@ def analyze_candidate_match(
     candidate_skills = candidate_skills or []
     job_requirements = job_requirements or []
 
-    candidate_norm = {_normalize_skill(s) for s in candidate_skills if _normalize_skill(s)}
-    matches: List[str] = []
-    gaps: List[str] = []
+    # Normalise une seule fois de chaque côté, puis appartenance O(1) par exigence
+    candidate_norm = {n for n in map(_normalize_skill, candidate_skills) if n}
+    requirements = [(req, n) for req, n in zip(job_requirements, map(_normalize_skill, job_requirements)) if n]
 
-    for req in job_requirements:
-        req_norm = _normalize_skill(req)
-        if not req_norm:
-            continue
-        if req_norm in candidate_norm:
-            matches.append(req)
-        else:
-            gaps.append(req)
+    matches: List[str] = [req for req, n in requirements if n in candidate_norm]
+    gaps: List[str] = [req for req, n in requirements if n not in candidate_norm]
 
-    denom = max(len([r for r in job_requirements if _normalize_skill(r)]), 1)
+    denom = max(len(requirements), 1)
     similarity = len(matches) / denom  # 0..1
     match_score = round(similarity * 100, 2) if score_in_percent else round(similarity, 4)
 
@@ -72,6 +69,10 @@ class MatchExplainer:
             score_in_percent=self.score_in_percent,
         )
 
+# Instance partagée (stateless) pour éviter une ré-instanciation par appel
+_explainer = MatchExplainer(score_in_percent=True)
+
+
 @tool
 def match_explainer_tool(candidate: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -93,5 +94,4 @@ def match_explainer_tool(candidate: Dict[str, Any], job: Dict[str, Any]) -> Dict
     if isinstance(job_requirements, str):
         job_requirements = [s.strip() for s in job_requirements.split(",") if s.strip()]
 
-    explainer = MatchExplainer(score_in_percent=True)
-    return explainer.explain(candidate_skills=candidate_skills, job_requirements=job_requirements)
\ No newline at end of file
+    return _explainer.explain(candidate_skills=candidate_skills, job_requirements=job_requirements)
\ No newline at end of file
@@ -8,28 +8,56 @@ Group: Recruiter Agent (Group 1)
 
 Tools:
 - job_scraper_tool: Scrape a job posting URL and return as Markdown
+
+Helpers:
+- scrape_jobs / scrape_jobs_async: Scrape many URLs concurrently
 """
 
+import asyncio
 import re
 from typing import Optional, List
+from urllib.parse import urlparse
 from langchain_core.tools import tool
 
 try:
     import requests
+    _HAS_REQUESTS = True
+except ImportError:
+    _HAS_REQUESTS = False
+
+try:
+    import httpx
+    _HAS_HTTPX = True
+except ImportError:
+    _HAS_HTTPX = False
+
+# Prefer selectolax's Lexbor backend (C HTML5 parser); fall back to BeautifulSoup
+# if unavailable. (selectolax.parser is the Modest backend, removed in 1.0.)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    _HAS_SELECTOLAX = True
+except ImportError:
+    _HAS_SELECTOLAX = False
+
+try:
     from bs4 import BeautifulSoup
-    _HAS_SCRAPING = True
+    _HAS_BS4 = True
 except ImportError:
-    _HAS_SCRAPING = False
-    print("Warning: requests or beautifulsoup4 not installed. job_scraper_tool will use fallback.")
+    _HAS_BS4 = False
+
+_HAS_SCRAPING = _HAS_REQUESTS and (_HAS_SELECTOLAX or _HAS_BS4)
+if not _HAS_SCRAPING:
+    print("Warning: requests or an HTML parser (selectolax/beautifulsoup4) not installed. job_scraper_tool will use fallback.")
 
 
 # ── Supported job boards ────────────────────────────────────
+# Board name -> (hostname substring, required path prefix). Checked in order;
+# any other http(s) URL is accepted as "generic".
 SUPPORTED_BOARDS = {
-    "linkedin": re.compile(r"https?://(www\.)?linkedin\.com/jobs", re.I),
-    "indeed": re.compile(r"https?://(www\.)?indeed\.", re.I),
-    "glassdoor": re.compile(r"https?://(www\.)?glassdoor\.", re.I),
-    "welcometothejungle": re.compile(r"https?://(www\.)?welcometothejungle\.", re.I),
-    "generic": re.compile(r"https?://", re.I),
+    "linkedin": ("linkedin.com", "/jobs"),
+    "indeed": ("indeed.", ""),
+    "glassdoor": ("glassdoor.", ""),
+    "welcometothejungle": ("welcometothejungle.", ""),
 }
 
 HEADERS = {
@@ -40,6 +68,23 @@ HEADERS = {
     )
 }
 
+REQUEST_TIMEOUT = 15
+
+# Shared HTTP session (singleton/lazy load) so repeat scrapes reuse TCP/TLS connections
+_session = None
+
+
+def _get_session() -> "requests.Session":
+    """Return the module-wide keep-alive session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
 
 def validate_job_url(url: str) -> dict:
     """
@@ -54,33 +99,43 @@ def validate_job_url(url: str) -> dict:
     if not url or not url.strip():
         return {"valid": False, "board": None, "error": "Empty URL provided"}
 
-    for board_name, pattern in SUPPORTED_BOARDS.items():
-        if pattern.search(url):
+    invalid = {"valid": False, "board": None, "error": "URL does not match any supported job board"}
+
+    try:
+        parsed = urlparse(url.strip())
+        host = (parsed.hostname or "").lower()
+    except ValueError:
+        return invalid
+
+    if parsed.scheme.lower() not in ("http", "https") or not host:
+        return invalid
+
+    for board_name, (host_needle, path_prefix) in SUPPORTED_BOARDS.items():
+        if host_needle in host and parsed.path.startswith(path_prefix):
             return {"valid": True, "board": board_name}
 
-    return {"valid": False, "board": None, "error": "URL does not match any supported job board"}
+    return {"valid": True, "board": "generic"}
 
 
-def _extract_text_blocks(soup: BeautifulSoup) -> str:
-    """Extract meaningful text blocks from HTML soup."""
-    # Remove scripts, styles, navs, footers
-    for element in soup(["script", "style", "nav", "footer", "header", "iframe", "noscript"]):
-        element.decompose()
+# Tags dropped before extraction, and tags whose text becomes a Markdown block
+_SKIP_TAGS = ["script", "style", "nav", "footer", "header", "iframe", "noscript"]
+_BLOCK_TAGS = ("h1", "h2", "h3", "h4", "p", "li", "span", "div")
 
-    lines = []
-    for tag in soup.find_all(["h1", "h2", "h3", "h4", "p", "li", "span", "div"]):
-        text = tag.get_text(separator=" ", strip=True)
-        if text and len(text) > 10:
-            # Convert headings to markdown
-            if tag.name in ("h1", "h2", "h3", "h4"):
-                prefix = "#" * int(tag.name[1])
-                lines.append(f"{prefix} {text}")
-            elif tag.name == "li":
-                lines.append(f"- {text}")
-            else:
-                lines.append(text)
-
-    # Deduplicate consecutive identical lines
+
+def _format_block(tag_name: str, text: str) -> Optional[str]:
+    """Convert a tag's text to a Markdown line, or None if too short."""
+    if not text or len(text) <= 10:
+        return None
+    # Convert headings to markdown
+    if tag_name in ("h1", "h2", "h3", "h4"):
+        return f"{'#' * int(tag_name[1])} {text}"
+    if tag_name == "li":
+        return f"- {text}"
+    return text
+
+
+def _join_blocks(lines: List[str]) -> str:
+    """Deduplicate consecutive identical lines and join as Markdown paragraphs."""
     deduped = []
     for line in lines:
         if not deduped or line != deduped[-1]:
@@ -89,6 +144,106 @@ def _extract_text_blocks(soup: BeautifulSoup) -> str:
     return "\n\n".join(deduped)
 
 
+def _extract_text_blocks(soup: "BeautifulSoup") -> str:
+    """Extract meaningful text blocks from HTML soup."""
+    # Remove scripts, styles, navs, footers
+    for element in soup(_SKIP_TAGS):
+        element.decompose()
+
+    lines = []
+    for tag in soup.find_all(list(_BLOCK_TAGS)):
+        line = _format_block(tag.name, tag.get_text(separator=" ", strip=True))
+        if line:
+            lines.append(line)
+
+    return _join_blocks(lines)
+
+
+def _node_text(node) -> str:
+    """
+    Text of a Lexbor node, joined like BeautifulSoup's get_text(separator=" ", strip=True).
+
+    Each text piece is stripped and empty (whitespace-only) pieces are
+    dropped before joining, so indentation between tags adds no spaces.
+    """
+    pieces = (
+        child.text_content.strip()
+        for child in node.traverse(include_text=True)
+        if child.tag == "-text"
+    )
+    return " ".join(piece for piece in pieces if piece)
+
+
+def _extract_text_blocks_fast(tree: "LexborHTMLParser") -> str:
+    """Extract meaningful text blocks from a selectolax tree (same output as _extract_text_blocks)."""
+    tree.strip_tags(_SKIP_TAGS)
+
+    root = tree.root
+    if root is None:
+        return ""
+
+    lines = []
+    # traverse() walks in document order, matching BeautifulSoup.find_all
+    for node in root.traverse():
+        if node.tag in _BLOCK_TAGS:
+            line = _format_block(node.tag, _node_text(node))
+            if line:
+                lines.append(line)
+
+    return _join_blocks(lines)
+
+
+def _parse_job_html(html: str) -> dict:
+    """
+    Parse a job posting page into its title and Markdown body.
+
+    Uses selectolax when installed, BeautifulSoup otherwise.
+
+    Args:
+        html: Raw HTML of the job posting.
+
+    Returns:
+        Dictionary with 'title' and 'job_description_md'.
+    """
+    if _HAS_SELECTOLAX:
+        tree = LexborHTMLParser(html)
+        title_node = tree.css_first("h1") or tree.css_first("title")
+        title = title_node.text(strip=True) if title_node else "Unknown Title"
+        job_md = _extract_text_blocks_fast(tree)
+    else:
+        soup = BeautifulSoup(html, "html.parser")
+        title_tag = soup.find("h1") or soup.find("title")
+        title = title_tag.get_text(strip=True) if title_tag else "Unknown Title"
+        job_md = _extract_text_blocks(soup)
+
+    return {
+        "title": title,
+        "job_description_md": job_md,
+    }
+
+
+# ── Requirement parsing tables (built once at import) ───────
+# Common tech skills to look for
+TECH_SKILLS = (
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
+    "react", "angular", "vue", "node.js", "django", "flask", "fastapi",
+    "spring boot", ".net", "sql", "nosql", "mongodb", "postgresql",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
+    "machine learning", "deep learning", "nlp", "computer vision",
+    "pytorch", "tensorflow", "scikit-learn", "pandas", "numpy",
+    "git", "ci/cd", "jenkins", "agile", "scrum",
+)
+
+_EXPERIENCE_PATTERN = re.compile(r"(\d+)\+?\s*(?:years?|ans?)\s*(?:of\s+)?experience")
+
+# Degree label -> keywords that imply it (substring match on lowercased text)
+_EDUCATION_KEYWORDS = (
+    ("Bachelor's Degree", ("bachelor", "licence")),
+    ("Master's Degree", ("master",)),
+    ("PhD", ("phd", "doctorate")),
+)
+
+
 def parse_job_requirements(job_description_md: str) -> dict:
     """
     Parse job requirements from scraped Markdown.
@@ -101,31 +256,17 @@ def parse_job_requirements(job_description_md: str) -> dict:
     """
     text_lower = job_description_md.lower()
 
-    # Common tech skills to look for
-    tech_skills = [
-        "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
-        "react", "angular", "vue", "node.js", "django", "flask", "fastapi",
-        "spring boot", ".net", "sql", "nosql", "mongodb", "postgresql",
-        "aws", "azure", "gcp", "docker", "kubernetes", "terraform",
-        "machine learning", "deep learning", "nlp", "computer vision",
-        "pytorch", "tensorflow", "scikit-learn", "pandas", "numpy",
-        "git", "ci/cd", "jenkins", "agile", "scrum",
-    ]
-
-    found_skills = [s for s in tech_skills if s in text_lower]
+    found_skills = [s for s in TECH_SKILLS if s in text_lower]
 
     # Try to find experience requirement
-    exp_match = re.search(r"(\d+)\+?\s*(?:years?|ans?)\s*(?:of\s+)?experience", text_lower)
+    exp_match = _EXPERIENCE_PATTERN.search(text_lower)
     min_experience = int(exp_match.group(1)) if exp_match else None
 
     # Try to find education requirement
-    education = []
-    if "bachelor" in text_lower or "licence" in text_lower:
-        education.append("Bachelor's Degree")
-    if "master" in text_lower:
-        education.append("Master's Degree")
-    if "phd" in text_lower or "doctorate" in text_lower:
-        education.append("PhD")
+    education = [
+        degree for degree, keywords in _EDUCATION_KEYWORDS
+        if any(k in text_lower for k in keywords)
+    ]
 
     return {
         "required_skills": found_skills,
@@ -135,6 +276,34 @@ def parse_job_requirements(job_description_md: str) -> dict:
     }
 
 
+def _new_result() -> dict:
+    """Empty scrape result with every key job_scraper_tool returns."""
+    return {
+        "success": False,
+        "job_description_md": "",
+        "title": "",
+        "company": "",
+        "location": "",
+        "requirements": {},
+        "error": None,
+    }
+
+
+def _fill_result(result: dict, html: str) -> dict:
+    """Parse fetched HTML into an existing scrape result and mark it successful."""
+    # Extract title and main text content as Markdown
+    parsed = _parse_job_html(html)
+    result["title"] = parsed["title"]
+    job_md = parsed["job_description_md"]
+    result["job_description_md"] = job_md
+
+    # Parse structured requirements from the text
+    result["requirements"] = parse_job_requirements(job_md)
+
+    result["success"] = True
+    return result
+
+
 @tool
 def job_scraper_tool(url: str) -> dict:
     """
@@ -156,15 +325,7 @@ def job_scraper_tool(url: str) -> dict:
         - requirements: Parsed requirements (if detectable)
         - error: Error message if scraping failed
     """
-    result = {
-        "success": False,
-        "job_description_md": "",
-        "title": "",
-        "company": "",
-        "location": "",
-        "requirements": {},
-        "error": None,
-    }
+    result = _new_result()
 
     # Validate URL
     validation = validate_job_url(url)
@@ -175,28 +336,15 @@ def job_scraper_tool(url: str) -> dict:
     if not _HAS_SCRAPING:
         result["error"] = (
             "Scraping libraries not installed. "
-            "Run: pip install requests beautifulsoup4"
+            "Run: pip install requests selectolax"
         )
         return result
 
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = _get_session().get(url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Extract title
-        title_tag = soup.find("h1") or soup.find("title")
-        result["title"] = title_tag.get_text(strip=True) if title_tag else "Unknown Title"
-
-        # Extract main text content as Markdown
-        job_md = _extract_text_blocks(soup)
-        result["job_description_md"] = job_md
-
-        # Parse structured requirements from the text
-        result["requirements"] = parse_job_requirements(job_md)
-
-        result["success"] = True
+        _fill_result(result, response.text)
 
     except requests.exceptions.Timeout:
         result["error"] = "Request timed out. The website took too long to respond."
@@ -221,3 +369,81 @@ def scrape_job(url: str) -> dict:
         Scraped job data dictionary.
     """
     return job_scraper_tool.invoke({"url": url})
+
+
+# ── Async batch scraping ────────────────────────────────────
+
+MAX_CONCURRENT_SCRAPES = 20
+
+
+async def _scrape_one_async(client: "httpx.AsyncClient", semaphore: asyncio.Semaphore, url: str) -> dict:
+    """Fetch and parse a single job URL on a shared async client."""
+    result = _new_result()
+
+    validation = validate_job_url(url)
+    if not validation["valid"]:
+        result["error"] = validation.get("error", "Invalid URL")
+        return result
+
+    try:
+        async with semaphore:
+            response = await client.get(url)
+        response.raise_for_status()
+
+        # HTML parsing is CPU-bound; keep it off the event loop
+        await asyncio.to_thread(_fill_result, result, response.text)
+
+    except httpx.TimeoutException:
+        result["error"] = "Request timed out. The website took too long to respond."
+    except httpx.ConnectError:
+        result["error"] = "Could not connect to the website. Check the URL and your internet."
+    except httpx.HTTPStatusError as e:
+        result["error"] = f"HTTP error: {e.response.status_code}"
+    except Exception as e:
+        result["error"] = f"Scraping failed: {str(e)}"
+
+    return result
+
+
+async def scrape_jobs_async(urls: List[str]) -> List[dict]:
+    """
+    Scrape several job posting URLs concurrently.
+
+    Args:
+        urls: Job posting URLs.
+
+    Returns:
+        One result dict per URL (same shape as job_scraper_tool), in input order.
+    """
+    if not (_HAS_HTTPX and (_HAS_SELECTOLAX or _HAS_BS4)):
+        result = _new_result()
+        result["error"] = (
+            "Scraping libraries not installed. "
+            "Run: pip install httpx selectolax"
+        )
+        return [dict(result) for _ in urls]
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+    limits = httpx.Limits(max_keepalive_connections=MAX_CONCURRENT_SCRAPES)
+    async with httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT,
+        limits=limits,
+        follow_redirects=True,
+    ) as client:
+        return list(await asyncio.gather(
+            *(_scrape_one_async(client, semaphore, url) for url in urls)
+        ))
+
+
+def scrape_jobs(urls: List[str]) -> List[dict]:
+    """
+    Batch job scraping function (synchronous wrapper around scrape_jobs_async).
+
+    Args:
+        urls: Job posting URLs.
+
+    Returns:
+        List of scraped job data dictionaries, in input order.
+    """
+    return asyncio.run(scrape_jobs_async(urls))
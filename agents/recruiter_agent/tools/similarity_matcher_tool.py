@@ -5,48 +5,47 @@ Computes semantic similarity between a candidate profile and a job description.
 Includes robust fallback to keyword matching if AI models fail to load.
 """
 
-import sys
+from functools import lru_cache
 from langchain_core.tools import tool
 from typing import Optional, Dict
 
-# robust import handling for ML libraries
-_model = None
-try:
-    from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-    
-    # Initialize model once
-    _model = SentenceTransformer("all-MiniLM-L6-v2")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load SentenceTransformer ({str(e)}). Using keyword-based fallback.", file=sys.stderr)
-    _model = None
-    cosine_similarity = None
+from agents.shared.embeddings import get_embedding_model
 
 
 def _candidate_json_to_text(candidate_profile: dict) -> str:
     """
     Convert structured candidate JSON into a single text string.
     """
-    sections = []
-
     skills = candidate_profile.get("skills")
-    if isinstance(skills, list) and skills:
-        sections.append("Skills: " + ", ".join(skills))
-
     experience = candidate_profile.get("experience")
-    if isinstance(experience, list) and experience:
-        # Handle list of strings or list of objects? Assuming strings based on graph.py
-        # graph.py passes: [f"{years} years experience"]
-        sections.append("Experience: " + ", ".join([str(e) for e in experience]))
-
     education = candidate_profile.get("education")
-    if isinstance(education, str) and education.strip():
-        sections.append("Education: " + education)
+
+    # Sections are built inline with f-strings; no intermediate per-item lists
+    parts = []
+    if skills and isinstance(skills, list):
+        parts.append(f"Skills: {', '.join(skills)}")
+    if experience and isinstance(experience, list):
+        # graph.py passes: [f"{years} years experience"]
+        parts.append(f"Experience: {', '.join(map(str, experience))}")
+    if isinstance(education, str):
+        if education.strip():
+            parts.append(f"Education: {education}")
     elif isinstance(education, list):
-         sections.append("Education: " + ", ".join([str(e) for e in education]))
+        parts.append(f"Education: {', '.join(map(str, education))}")
 
-    return ". ".join(sections)
+    return ". ".join(parts)
+
+
+@lru_cache(maxsize=128)
+def _embed_job_description(job_description: str):
+    """
+    Encode a job description once and reuse the vector.
+
+    cv_ranker scores every candidate against the same JD, so caching here
+    removes the repeated tokenization and forward pass for the JD side.
+    The returned array is shared between callers and must not be mutated.
+    """
+    return get_embedding_model().encode(job_description, normalize_embeddings=True)
 
 
 def _keyword_similarity(candidate_text: str, job_description: str) -> float:
@@ -83,17 +82,23 @@ def similarity_matcher_tool(candidate_profile: dict, job_description: str) -> di
     try:
         candidate_text = _candidate_json_to_text(candidate_profile)
         
-        # Use Transformer model if available
-        if _model:
-            embeddings = _model.encode(
-                [candidate_text, job_description],
+        # Use Transformer model if available (loaded on the first call)
+        model = get_embedding_model()
+        if model is not None:
+            import numpy as np
+
+            candidate_embedding = model.encode(
+                candidate_text,
                 normalize_embeddings=True
             )
+            job_embedding = _embed_job_description(job_description)
 
-            candidate_embedding = embeddings[0].reshape(1, -1)
-            job_embedding = embeddings[1].reshape(1, -1)
-
-            similarity = cosine_similarity(candidate_embedding, job_embedding)[0][0]
+            # Both vectors are unit-normalized, so cosine similarity is the dot product
+            # (accumulate in FP32 in case the model runs in FP16)
+            similarity = np.dot(
+                candidate_embedding.astype(np.float32, copy=False).ravel(),
+                job_embedding.astype(np.float32, copy=False).ravel(),
+            )
             
             return {
                 "similarity_score": round(float(similarity) * 100, 2)
@@ -1,4 +1,6 @@
 from .state import AgentState
+from .semantic_cache import SemanticCache
+from .embeddings import get_embedding_model
 from .utils import (
     setup_logger,
     logger,
@@ -10,6 +12,9 @@ from .utils import (
     normalize_skill,
     create_initial_state,
     extract_last_message,
+    store_cv_text,
+    load_cv_text,
+    delete_cv_texts,
     HRPlatformError,
     CVParsingError,
     TemplateNotFoundError,
@@ -18,6 +23,8 @@ from .utils import (
 
 __all__ = [
     "AgentState",
+    "SemanticCache",
+    "get_embedding_model",
     "setup_logger",
     "logger",
     "get_env_config",
@@ -28,6 +35,9 @@ __all__ = [
     "normalize_skill",
     "create_initial_state",
     "extract_last_message",
+    "store_cv_text",
+    "load_cv_text",
+    "delete_cv_texts",
     "HRPlatformError",
     "CVParsingError",
     "TemplateNotFoundError",
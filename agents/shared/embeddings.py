@@ -0,0 +1,69 @@
+"""
+Shared Embeddings - One MiniLM model per process.
+
+This module owns the sentence-transformers model used outside the RAG store:
+- The recruiter's similarity matcher scores candidates with it
+- The supervisor's semantic cache embeds requests with it
+
+The model is loaded on first use, not at import. sentence-transformers and
+torch are optional; without them get_embedding_model() returns None and
+callers fall back to their non-embedding paths.
+"""
+
+import os
+import threading
+from typing import Any, Optional
+
+from .utils import logger
+
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+_model = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def _load_model():
+    """Load, place and warm up the model; raises if the ML stack is missing."""
+    from sentence_transformers import SentenceTransformer
+    import torch
+
+    # Thread count is process-wide, so only change it when explicitly asked to
+    if os.getenv("TORCH_NUM_THREADS"):
+        torch.set_num_threads(int(os.environ["TORCH_NUM_THREADS"]))
+
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+    # On GPU, run in FP16: embeddings are normalized, so cosine stays stable
+    if torch.cuda.is_available():
+        model = model.to("cuda").half()
+    model.eval()
+
+    # Warm up kernels so the first real call doesn't pay lazy initialization
+    model.encode(["warmup text"], normalize_embeddings=True)
+    return model
+
+
+def get_embedding_model() -> Optional[Any]:
+    """
+    Return the shared MiniLM SentenceTransformer, loading it on first call.
+
+    A failed load is not retried, so callers can call this on every request.
+
+    Returns:
+        The model, or None if sentence-transformers/torch could not load it.
+    """
+    global _model, _load_attempted
+    if not _load_attempted:
+        with _load_lock:
+            if not _load_attempted:
+                try:
+                    _model = _load_model()
+                except Exception as e:
+                    logger.warning(
+                        f"Could not load SentenceTransformer ({e}). Using keyword-based fallbacks."
+                    )
+                    _model = None
+                _load_attempted = True
+    return _model
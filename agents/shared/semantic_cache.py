@@ -0,0 +1,126 @@
+"""
+Semantic Response Cache - Collapse paraphrased requests onto cached results.
+
+This module contains a small in-memory semantic cache:
+- Inputs are embedded with a sentence-transformers model
+- Embeddings are searched with a FAISS inner-product index
+- A hit requires cosine similarity >= threshold within the same namespace
+
+Both libraries are optional; without them the cache is simply disabled.
+"""
+
+from typing import Any, Callable, Hashable, Optional
+
+from .utils import logger
+
+
+class SemanticCache:
+    """
+    In-memory semantic cache keyed by embedding similarity.
+
+    Entries live in separate namespaces (e.g. route + job context) so a
+    paraphrase only matches results computed under the same conditions.
+
+    Attributes:
+        threshold: Minimum cosine similarity for a hit.
+        max_entries: Per-namespace capacity; a full namespace is reset.
+        model_name: sentence-transformers model used for embeddings.
+        model_loader: Optional callable returning an already-loaded model
+            (or None), used instead of loading model_name a second time.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 1024,
+        model_name: str = "all-MiniLM-L6-v2",
+        model_loader: Optional[Callable[[], Any]] = None
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self.model_loader = model_loader
+        self._model = None
+        self._available = True
+        # namespace -> (faiss index, list of cached values aligned with index ids)
+        self._namespaces: dict[Hashable, tuple[Any, list[Any]]] = {}
+
+    def _get_model(self):
+        """Load the embedding model on first use; disable the cache if unavailable."""
+        if self._model is None and self._available:
+            try:
+                import faiss  # noqa: F401  (checked here so lookups can rely on it)
+                if self.model_loader is not None:
+                    self._model = self.model_loader()
+                    if self._model is None:
+                        raise RuntimeError("shared embedding model unavailable")
+                else:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+            except Exception as e:
+                logger.warning(f"Semantic cache disabled ({e})")
+                self._available = False
+        return self._model
+
+    def embed(self, text: str):
+        """
+        Embed a request for lookup/store.
+
+        Args:
+            text: The request text.
+
+        Returns:
+            A (1, dim) float32 normalized embedding, or None if the cache is disabled.
+        """
+        model = self._get_model()
+        if model is None:
+            return None
+        return model.encode([text], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, embedding, namespace: Hashable) -> Optional[Any]:
+        """
+        Return the cached value closest to embedding, if similar enough.
+
+        Args:
+            embedding: Embedding returned by embed().
+            namespace: Partition to search.
+
+        Returns:
+            The cached value or None on a miss.
+        """
+        entry = self._namespaces.get(namespace)
+        if embedding is None or entry is None:
+            return None
+
+        index, values = entry
+        scores, ids = index.search(embedding, 1)
+        if ids[0][0] >= 0 and scores[0][0] >= self.threshold:
+            return values[ids[0][0]]
+        return None
+
+    def store(self, embedding, namespace: Hashable, value: Any) -> None:
+        """
+        Cache a value under an embedding.
+
+        Args:
+            embedding: Embedding returned by embed().
+            namespace: Partition to store into.
+            value: The value to cache (stored by reference).
+        """
+        if embedding is None:
+            return
+
+        import faiss
+
+        entry = self._namespaces.get(namespace)
+        if entry is None or len(entry[1]) >= self.max_entries:
+            entry = (faiss.IndexFlatIP(embedding.shape[1]), [])
+            self._namespaces[namespace] = entry
+
+        index, values = entry
+        index.add(embedding)
+        values.append(value)
+
+    def clear(self) -> None:
+        """Drop every cached entry (the embedding model stays loaded)."""
+        self._namespaces.clear()
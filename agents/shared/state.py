@@ -8,6 +8,19 @@ import operator
 from langchain_core.messages import BaseMessage
 
 
+def _merge_shallow(current: dict[str, Any], update: dict[str, Any]) -> dict[str, Any]:
+    """
+    Reducer for job_context: shallow-merge a node's delta into the shared context.
+    
+    Nodes only return the keys they changed, so each step costs O(delta)
+    on the node side instead of copying the whole context.
+    """
+    if not update:
+        return current
+    # Always build a new dict so in-place edits by one graph never leak into another's state
+    return {**current, **update}
+
+
 class AgentState(TypedDict):
     """
     The global state shared across all agents in the system.
@@ -18,7 +31,8 @@ class AgentState(TypedDict):
         next: The next agent/node to route to (used by conditional edges).
         job_context: A shared dictionary for passing data between agents
                      (e.g., extracted skills, candidate IDs, job requirements).
+                     Uses _merge_shallow, so nodes may return only changed keys.
     """
     messages: Annotated[list[BaseMessage], operator.add]
     next: str
-    job_context: dict[str, Any]
+    job_context: Annotated[dict[str, Any], _merge_shallow]
@@ -9,6 +9,9 @@ This module contains generic utilities used across the system:
 
 import logging
 import os
+import secrets
+import shutil
+import time
 from functools import lru_cache
 from typing import Optional
 from pathlib import Path
@@ -229,6 +232,94 @@ def extract_last_message(state: dict) -> Optional[str]:
     return last_msg.content if hasattr(last_msg, 'content') else str(last_msg)
 
 
+# Uploaded CV texts live on disk; job_context only holds a reference ("cv_ref")
+CV_TEXT_SUBDIR = "cv_text"
+
+# Conversations that stopped writing CVs this long ago are purged (seconds)
+CV_TEXT_MAX_AGE = 24 * 3600
+
+
+def _cv_store_root() -> Path:
+    """Private (0700) directory holding every conversation's CV texts."""
+    root = Path(get_env_config()["cv_upload_dir"]) / CV_TEXT_SUBDIR
+    root.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(root, 0o700)  # mkdir's mode is subject to the umask
+    return root
+
+
+def store_cv_text(text: str, conversation_id: str) -> str:
+    """
+    Write a CV's extracted text to the conversation's private directory.
+    
+    Files are only readable by the app's user (0600 in a 0700 directory),
+    have random names, and are removed with delete_cv_texts() or after
+    CV_TEXT_MAX_AGE once the conversation goes quiet.
+    
+    Args:
+        text: The extracted CV text.
+        conversation_id: Owner of the file (the session's thread id).
+    
+    Returns:
+        Path of the stored file, to be kept in job_context["cv_ref"].
+    """
+    root = _cv_store_root()
+    purge_stale_cv_texts(root)
+    
+    directory = root / conversation_id
+    directory.mkdir(mode=0o700, exist_ok=True)
+    path = directory / f"{secrets.token_hex(16)}.txt"
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    return str(path)
+
+
+def delete_cv_texts(conversation_id: str) -> None:
+    """Remove every CV text stored for a conversation."""
+    shutil.rmtree(_cv_store_root() / conversation_id, ignore_errors=True)
+
+
+def purge_stale_cv_texts(root: Optional[Path] = None) -> None:
+    """
+    Remove CV texts of conversations idle for more than CV_TEXT_MAX_AGE.
+    
+    Streamlit gives no signal when a session ends, so abandoned
+    conversations are cleaned up here instead.
+    """
+    root = root or _cv_store_root()
+    cutoff = time.time() - CV_TEXT_MAX_AGE
+    for directory in root.iterdir():
+        try:
+            if directory.stat().st_mtime < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def load_cv_text(job_context: dict) -> Optional[str]:
+    """
+    Get the current CV text from a job context.
+    
+    Args:
+        job_context: Context holding either "current_cv_text" or a "cv_ref" path.
+    
+    Returns:
+        The CV text, or None if no CV is available.
+    """
+    text = job_context.get("current_cv_text")
+    if text:
+        return text
+    
+    ref = job_context.get("cv_ref")
+    if not ref:
+        return None
+    try:
+        return Path(ref).read_text(encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"Could not read stored CV {ref}: {e}")
+        return None
+
+
 # ============================================================
 # ERROR HANDLING
 # ============================================================
@@ -8,16 +8,41 @@ This module implements the Supervisor Pattern that routes tasks between:
 The supervisor uses an LLM to analyze user intent and route appropriately.
 """
 
-from typing import Literal
+import copy
+import functools
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    AIMessage,
+    messages_from_dict,
+    messages_to_dict,
+)
 from langchain_core.language_models.fake import FakeListLLM
 
+try:
+    import ahocorasick
+    _HAS_AHOCORASICK = True
+except ImportError:
+    _HAS_AHOCORASICK = False
+
+try:
+    import xxhash
+    _HAS_XXHASH = True
+except ImportError:
+    _HAS_XXHASH = False
+
 from agents.shared.state import AgentState
-from agents.recruiter_agent import recruiter_graph
-from agents.manager_agent import manager_graph
+from agents.shared.semantic_cache import SemanticCache
+from agents.shared.embeddings import get_embedding_model
 
 
 # Define the possible routing destinations
@@ -63,6 +88,70 @@ Always respond with a JSON object containing:
 - "reasoning": Brief explanation of your decision
 """
 
+# Reused by reference so the prompt prefix stays byte-identical across turns
+SUPERVISOR_SYSTEM_MESSAGE = SystemMessage(content=SUPERVISOR_SYSTEM_PROMPT)
+
+# Static node output texts, formatted once. Each call still gets a fresh
+# AIMessage: LangGraph assigns ids to emitted messages, so a shared instance
+# would carry the first turn's id and be skipped by later message streams.
+_ROUTE_CONTENTS = {
+    route: f"🔀 **Supervisor Decision**: Routing to `{route}`"
+    for route in (*TEAM_MEMBERS, FINISH)
+}
+
+_GREETING_CONTENT = (
+    "👋 Hello! I'm your HR Recruitment Assistant.\n\n"
+    "I can help you with:\n"
+    "- **CV Analysis & Ranking** → Lead Recruiter\n"
+    "- **Job Offers & Templates** → Hiring Manager\n\n"
+    "What would you like to do today?"
+)
+
+
+# Keywords for Lead Recruiter
+RECRUITER_KEYWORDS = frozenset({
+    "cv", "resume", "parse", "analyze", "rank", "score", 
+    "skill", "extract", "scrape", "screen",
+    "application", "applicant", "profile"
+})
+
+# Keywords for Hiring Manager
+MANAGER_KEYWORDS = frozenset({
+    "offer", "template", "email", "draft", "write", 
+    "job description", "interview", "letter", "invitation",
+    "communication", "generate offer", "create job", "hiring"
+})
+
+# One-pass ASCII normalization for routing: lowercase letters, keep digits,
+# turn punctuation/whitespace into spaces
+_ROUTING_TRANSLATION = str.maketrans({
+    c: c.lower() if c.isalpha() else (c if c.isdigit() else " ")
+    for c in map(chr, range(128))
+})
+
+
+def _build_keyword_automaton():
+    """
+    Build an Aho-Corasick automaton mapping every routing keyword to its agent.
+    
+    Returns:
+        The automaton, or None if pyahocorasick is not installed.
+    """
+    if not _HAS_AHOCORASICK:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in RECRUITER_KEYWORDS:
+        automaton.add_word(keyword, "Lead_Recruiter")
+    for keyword in MANAGER_KEYWORDS:
+        automaton.add_word(keyword, "Hiring_Manager")
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once at import so routing is a single linear scan per message
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
 
 def create_supervisor_llm():
     """
@@ -90,6 +179,80 @@ def create_supervisor_llm():
     return FakeListLLM(responses=fake_responses)
 
 
+def _route_decision_from_trusted(data: dict) -> RouteDecision:
+    """
+    Build a RouteDecision from already schema-constrained output without re-validating.
+    
+    Structured output has enforced the schema provider-side, so
+    `model_construct` skips pydantic's field validation on the hot path.
+    """
+    return RouteDecision.model_construct(**data)
+
+
+@functools.cache
+def _get_router_llm():
+    """
+    Return the supervisor LLM bound to the RouteDecision schema (built once per process).
+    
+    Chat models get native structured output against the JSON schema and
+    the resulting dict is wrapped without re-validation; plain LLMs such as
+    the FakeListLLM placeholder produce free text, so they are piped into a
+    validating PydanticOutputParser instead. Either way the schema is
+    compiled once, not per routing decision.
+    """
+    llm = create_supervisor_llm()
+    try:
+        structured = llm.with_structured_output(RouteDecision.model_json_schema())
+    except (NotImplementedError, AttributeError):
+        from langchain_core.output_parsers import PydanticOutputParser
+        return llm | PydanticOutputParser(pydantic_object=RouteDecision)
+    
+    from langchain_core.runnables import RunnableLambda
+    return structured | RunnableLambda(_route_decision_from_trusted)
+
+
+def _with_cache_breakpoint(message: BaseMessage) -> BaseMessage:
+    """Return a copy of message whose content carries an Anthropic cache_control marker."""
+    content = message.content
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content}]
+    content = [dict(block) for block in content]
+    content[-1]["cache_control"] = {"type": "ephemeral"}
+    return message.model_copy(update={"content": content})
+
+
+def _build_prompt(state: AgentState, cache_control: bool = False) -> list[BaseMessage]:
+    """
+    Assemble the supervisor LLM prompt in prefix-cache-friendly order.
+    
+    Order: static system prompt -> committed history -> job context -> latest
+    user message. Everything before the job context is identical from one
+    turn to the next, so provider prompt caches (OpenAI, Anthropic) hit.
+    
+    Args:
+        state: Current agent state with messages and context.
+        cache_control: Mark the end of the stable prefix with an Anthropic
+            `cache_control` breakpoint.
+    
+    Returns:
+        The ordered list of messages to send to the LLM.
+    """
+    messages = state.get("messages", [])
+    history, latest = messages[:-1], messages[-1:]
+    
+    prompt = [SUPERVISOR_SYSTEM_MESSAGE, *history]
+    if cache_control:
+        prompt[-1] = _with_cache_breakpoint(prompt[-1])
+    
+    job_context = state.get("job_context") or {}
+    if job_context:
+        prompt.append(SystemMessage(
+            content="Current job context:\n" + json.dumps(job_context, sort_keys=True, default=str)
+        ))
+    
+    return prompt + latest
+
+
 def determine_route(user_message: str) -> str:
     """
     Simple rule-based routing as fallback/demo.
@@ -101,32 +264,28 @@ def determine_route(user_message: str) -> str:
     Returns:
         The routing decision string.
     """
-    message_lower = user_message.lower()
+    message_lower = user_message.translate(_ROUTING_TRANSLATION)
     
-    # Keywords for Lead Recruiter
-    recruiter_keywords = [
-        "cv", "resume", "parse", "analyze", "rank", "score", 
-        "skill", "extract", "scrape", "screen",
-        "application", "applicant", "profile"
-    ]
-    
-    # Keywords for Hiring Manager
-    manager_keywords = [
-        "offer", "template", "email", "draft", "write", 
-        "job description", "interview", "letter", "invitation",
-        "communication", "generate offer", "create job", "hiring"
-    ]
+    if _KEYWORD_AUTOMATON is not None:
+        # Single pass over the message; any manager hit wins
+        route = FINISH
+        for _, label in _KEYWORD_AUTOMATON.iter(message_lower):
+            if label == "Hiring_Manager":
+                return label
+            route = label
+        return route
     
+    # Without pyahocorasick: the same substring matching, one scan per keyword
     # Check for manager keywords FIRST (tasks often involve candidates but are manager actions)
-    if any(keyword in message_lower for keyword in manager_keywords):
+    if any(keyword in message_lower for keyword in MANAGER_KEYWORDS):
         return "Hiring_Manager"
     
     # Check for recruiter keywords
-    if any(keyword in message_lower for keyword in recruiter_keywords):
+    if any(keyword in message_lower for keyword in RECRUITER_KEYWORDS):
         return "Lead_Recruiter"
     
     # Default to FINISH for greetings or unclear requests
-    return "FINISH"
+    return FINISH
 
 
 def supervisor_node(state: AgentState) -> dict:
@@ -154,42 +313,58 @@ def supervisor_node(state: AgentState) -> dict:
     last_message = messages[-1]
     user_input = last_message.content if hasattr(last_message, 'content') else str(last_message)
     
-    # Use rule-based routing for demo (replace with LLM in production)
+    # Use rule-based routing for demo (replace with LLM in production:
+    # _get_router_llm().invoke(_build_prompt(state)), with cache_control=True for Anthropic)
     route = determine_route(user_input)
     
     # Log the routing decision
-    routing_message = AIMessage(
-        content=f"🔀 **Supervisor Decision**: Routing to `{route}`"
-    )
-    
     return {
         "next": route,
-        "messages": [routing_message]
+        "messages": [AIMessage(content=_ROUTE_CONTENTS[route])]
     }
 
 
-def recruiter_node(state: AgentState) -> dict:
+def _subgraph_delta(state: AgentState, result: dict) -> dict:
     """
-    Wrapper node that invokes the Lead Recruiter sub-graph.
+    Reduce a sub-graph's final state to what it added on top of `state`.
+    
+    Only new messages are returned (the messages reducer appends, so
+    returning the full list would duplicate the history), and only
+    job_context keys whose values were added or replaced.
     """
-    # Invoke the recruiter sub-graph
-    result = recruiter_graph.invoke(state)
+    before_messages = state.get("messages", [])
+    before_context = state.get("job_context") or {}
+    after_context = result.get("job_context") or {}
+    
     return {
-        "messages": result.get("messages", []),
-        "job_context": result.get("job_context", state.get("job_context", {}))
+        "messages": result.get("messages", [])[len(before_messages):],
+        "job_context": {
+            key: value for key, value in after_context.items()
+            if key not in before_context or before_context[key] is not value
+        }
     }
 
 
+def recruiter_node(state: AgentState) -> dict:
+    """
+    Wrapper node that invokes the Lead Recruiter sub-graph.
+    """
+    # Imported on first use so sub-graph deps only load when this agent runs
+    from agents.recruiter_agent import recruiter_graph
+    
+    # Run the recruiter sub-graph
+    return _subgraph_delta(state, recruiter_graph.invoke(state))
+
+
 def manager_node(state: AgentState) -> dict:
     """
     Wrapper node that invokes the Hiring Manager sub-graph.
     """
-    # Invoke the manager sub-graph
-    result = manager_graph.invoke(state)
-    return {
-        "messages": result.get("messages", []),
-        "job_context": result.get("job_context", state.get("job_context", {}))
-    }
+    # Imported on first use so sub-graph deps only load when this agent runs
+    from agents.manager_agent import manager_graph
+    
+    # Run the manager sub-graph
+    return _subgraph_delta(state, manager_graph.invoke(state))
 
 
 def finish_node(state: AgentState) -> dict:
@@ -198,21 +373,29 @@ def finish_node(state: AgentState) -> dict:
     """
     messages = state.get("messages", [])
     
-    # Check if we already have a response
-    if len(messages) <= 2:  # Only user message + routing message
-        return {
-            "messages": [AIMessage(
-                content="👋 Hello! I'm your HR Recruitment Assistant.\n\n"
-                "I can help you with:\n"
-                "- **CV Analysis & Ranking** → Lead Recruiter\n"
-                "- **Job Offers & Templates** → Hiring Manager\n\n"
-                "What would you like to do today?"
-            )]
-        }
+    # Check if we already have a response for this turn
+    # (history may precede it when the graph runs with a checkpointer)
+    turn = messages[-2:]
+    if len(turn) < 2 or isinstance(turn[0], HumanMessage):  # Only user message + routing message
+        return {"messages": [AIMessage(content=_GREETING_CONTENT)]}
     return {}
 
 
-def route_to_agent(state: AgentState) -> str:
+# Routing decision -> graph node; anything else (FINISH, empty) goes to "finish"
+_ROUTE_TABLE = {
+    "Lead_Recruiter": "recruiter",
+    "Hiring_Manager": "manager",
+}
+
+# Conditional-edge destinations, shared with LangGraph as-is
+_PATH_MAP = {
+    "recruiter": "recruiter",
+    "manager": "manager",
+    "finish": "finish",
+}
+
+
+def route_to_agent(state: AgentState) -> Literal["recruiter", "manager", "finish"]:
     """
     Conditional edge function that returns the next node based on state.
     
@@ -222,20 +405,19 @@ def route_to_agent(state: AgentState) -> str:
     Returns:
         The name of the next node to execute.
     """
-    next_step = state.get("next", "FINISH")
-    
-    if next_step == "Lead_Recruiter":
-        return "recruiter"
-    elif next_step == "Hiring_Manager":
-        return "manager"
-    else:
-        return "finish"
+    return _ROUTE_TABLE.get(state.get("next"), "finish")
 
 
-def build_supervisor_graph() -> StateGraph:
+def build_supervisor_graph(checkpointer=None) -> StateGraph:
     """
     Builds and compiles the main supervisor graph.
     
+    Args:
+        checkpointer: Optional LangGraph checkpointer (e.g. MemorySaver). When set,
+            state persists per `thread_id` and each invocation only needs to
+            pass the new message; callers must supply
+            `config={"configurable": {"thread_id": ...}}`.
+    
     Returns:
         A compiled StateGraph implementing the hierarchical supervisor pattern.
     """
@@ -252,26 +434,154 @@ def build_supervisor_graph() -> StateGraph:
     graph.set_entry_point("supervisor")
     
     # Add conditional edges from supervisor
-    graph.add_conditional_edges(
-        "supervisor",
-        route_to_agent,
-        {
-            "recruiter": "recruiter",
-            "manager": "manager",
-            "finish": "finish"
-        }
-    )
+    graph.add_conditional_edges("supervisor", route_to_agent, _PATH_MAP)
     
     # All agents route back to END after processing
     graph.add_edge("recruiter", END)
     graph.add_edge("manager", END)
     graph.add_edge("finish", END)
     
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
+
 
+# Compiled supervisor graph (singleton/lazy load)
+_supervisor_graph = None
 
-# Export the compiled supervisor graph
-supervisor_graph = build_supervisor_graph()
+
+def get_supervisor_graph():
+    """
+    Return the process-wide compiled supervisor graph, compiling it on first use.
+    
+    Returns:
+        The compiled supervisor graph.
+    """
+    global _supervisor_graph
+    if _supervisor_graph is None:
+        _supervisor_graph = build_supervisor_graph()
+    return _supervisor_graph
+
+
+def __getattr__(name: str):
+    """Keep `supervisor_graph` importable without compiling it at import time."""
+    if name == "supervisor_graph":
+        return get_supervisor_graph()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+
+# Max number of (input, context) results kept by run_supervisor
+RESPONSE_CACHE_SIZE = 512
+
+# LRU of cache key -> serialized final state
+_response_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+# Paraphrase-level cache consulted after the exact LRU misses; it shares the
+# process-wide MiniLM model with the similarity matcher
+_semantic_cache = SemanticCache(threshold=0.92, model_loader=get_embedding_model)
+
+# URLs, emails, digits and quoted text: parameters a paraphrase match would ignore
+_PARAMETER_PATTERN = re.compile(r"https?://|www\.|\S@\S|\d|[\"`]")
+
+
+def _has_parameters(user_input: str) -> bool:
+    """
+    Tell whether a request names specific entities.
+    
+    "Write an offer for Alice" and "... for Bob" (or two job URLs) embed
+    above the similarity threshold but need different answers, so such
+    requests never use the semantic cache. Entities are URLs, emails,
+    numbers, quoted text and capitalized words inside a sentence.
+    """
+    if _PARAMETER_PATTERN.search(user_input):
+        return True
+    
+    tokens = user_input.split()
+    for previous, token in zip(tokens, tokens[1:]):
+        if token[:1].isupper() and token != "I" and not previous.endswith((".", "!", "?", ":")):
+            return True
+    return False
+
+
+def _context_key(job_context: dict) -> Optional[tuple]:
+    """
+    Build a hashable key for a job context.
+    
+    Args:
+        job_context: Shared context dictionary.
+    
+    Returns:
+        A hashable key, or None if the context holds unhashable values
+        (the request then bypasses the caches).
+    """
+    try:
+        ctx_key = tuple(sorted(job_context.items()))
+        hash(ctx_key)
+    except TypeError:
+        return None
+    return ctx_key
+
+
+def _hash_input(user_input: str) -> int:
+    """
+    64-bit digest of the input (compact key even for pasted CVs).
+    
+    Only surrounding whitespace is ignored: case is significant (URL paths,
+    names), so differently-cased requests never share an entry.
+    """
+    data = user_input.strip().encode("utf-8")
+    if _HAS_XXHASH:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _response_cache_key(user_input: str, ctx_key: tuple) -> tuple:
+    """Build the exact response-cache key for a request."""
+    return (_hash_input(user_input), ctx_key)
+
+
+def _serialize_state(state: dict) -> dict:
+    """Detach a final state from live message/context objects for caching."""
+    return {
+        "messages": messages_to_dict(state.get("messages", [])),
+        "next": state.get("next", ""),
+        "job_context": copy.deepcopy(state.get("job_context", {})),
+    }
+
+
+def _deserialize_state(cached: dict) -> dict:
+    """Rebuild a fresh state from a cache entry so callers can't mutate it."""
+    return {
+        "messages": messages_from_dict(cached["messages"]),
+        "next": cached["next"],
+        "job_context": copy.deepcopy(cached["job_context"]),
+    }
+
+
+def _run_finish_path(state: dict) -> dict:
+    """
+    Produce the final state of a FINISH-routed run without invoking the graph.
+    
+    Applies supervisor_node then finish_node exactly as the graph would,
+    so the result is identical to `supervisor_graph.invoke(state)`.
+    """
+    decision = supervisor_node(state)
+    state = {
+        **state,
+        "next": decision["next"],
+        "messages": state["messages"] + decision["messages"],
+    }
+    state["messages"] = state["messages"] + finish_node(state).get("messages", [])
+    return state
+
+
+def clear_response_cache() -> None:
+    """Drop every cached supervisor response (exact and semantic)."""
+    _response_cache.clear()
+    _semantic_cache.clear()
 
 
 # Convenience function for running the graph
@@ -279,6 +589,15 @@ def run_supervisor(user_input: str, job_context: dict = None) -> dict:
     """
     Convenience function to run the supervisor graph with a user input.
     
+    Requests routed to FINISH are answered without invoking the graph.
+    With a hashable job context, identical requests (same input up to
+    surrounding whitespace) are served from an in-memory LRU cache, and
+    paraphrases of earlier requests (same route, cosine >= 0.92, no names,
+    URLs or numbers in the request) from a semantic cache.
+    
+    These shortcuts apply to this function only; the Streamlit app streams
+    its checkpointed graph directly and does not go through them.
+    
     Args:
         user_input: The user's message/request.
         job_context: Optional shared context dictionary.
@@ -286,10 +605,90 @@ def run_supervisor(user_input: str, job_context: dict = None) -> dict:
     Returns:
         The final state after graph execution.
     """
+    job_context = job_context or {}
+    
     initial_state = {
         "messages": [HumanMessage(content=user_input)],
         "next": "",
-        "job_context": job_context or {}
+        "job_context": job_context
     }
     
-    return supervisor_graph.invoke(initial_state)
+    # Greetings/unclear requests only produce static messages: run the two
+    # nodes directly instead of paying for a full graph invocation
+    route = determine_route(user_input)
+    if route == FINISH:
+        return _run_finish_path(initial_state)
+    
+    ctx_key = _context_key(job_context)
+    if ctx_key is None:
+        return get_supervisor_graph().invoke(initial_state)
+    
+    cache_key = _response_cache_key(user_input, ctx_key)
+    if cache_key in _response_cache:
+        _response_cache.move_to_end(cache_key)
+        result = _deserialize_state(_response_cache[cache_key])
+        # The cached run started from another caller's message object
+        result["messages"][0] = initial_state["messages"][0]
+        return result
+    
+    # Paraphrases only match results for the same route and context, and
+    # only for requests without entity parameters
+    namespace = (route, ctx_key)
+    embedding = None if _has_parameters(user_input) else _semantic_cache.embed(user_input)
+    cached = _semantic_cache.lookup(embedding, namespace)
+    if cached is not None:
+        result = _deserialize_state(cached)
+        result["messages"][0] = initial_state["messages"][0]
+        return result
+    
+    result = get_supervisor_graph().invoke(initial_state)
+    
+    serialized = _serialize_state(result)
+    _response_cache[cache_key] = serialized
+    if len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+    _semantic_cache.store(embedding, namespace, serialized)
+    
+    return result
+
+
+def run_supervisor_batch(
+    user_inputs: list[str],
+    job_context: dict = None,
+    max_concurrency: int = 4,
+    job_contexts: Optional[list[dict]] = None
+) -> list[dict]:
+    """
+    Run several independent requests through the supervisor graph at once.
+    
+    Uses LangGraph's `.batch()`, which executes the runs concurrently, so
+    I/O-bound sub-graphs (RAG, scraping) overlap instead of running back to back.
+    
+    Args:
+        user_inputs: The user messages/requests.
+        job_context: Optional shared context dictionary (copied per run).
+        max_concurrency: Maximum number of runs in flight.
+        job_contexts: Optional per-request context, merged over job_context
+            (e.g. one CV per run); must be the same length as user_inputs.
+    
+    Returns:
+        The final states, in the same order as user_inputs.
+    
+    Raises:
+        ValueError: If job_contexts and user_inputs differ in length.
+    """
+    if job_contexts is not None and len(job_contexts) != len(user_inputs):
+        raise ValueError(
+            f"job_contexts has {len(job_contexts)} entries for {len(user_inputs)} inputs"
+        )
+    per_run = job_contexts if job_contexts is not None else [{}] * len(user_inputs)
+    states = [
+        {
+            "messages": [HumanMessage(content=user_input)],
+            "next": "",
+            "job_context": {**(job_context or {}), **extra}
+        }
+        for user_input, extra in zip(user_inputs, per_run)
+    ]
+    
+    return get_supervisor_graph().batch(states, config={"max_concurrency": max_concurrency})
@@ -5,12 +5,15 @@ A Multi-Agent System (MAS) powered by LangGraph for intelligent recruitment.
 Features a hierarchical supervisor pattern routing between specialized agents.
 """
 
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from uuid import uuid4
+
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 
-from agents.supervisor import supervisor_graph
-from agents.recruiter_agent.tools.parsers import cv_parser_tool
-
 
 # Page configuration
 st.set_page_config(
@@ -20,8 +23,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+
+@st.cache_data
+def custom_css() -> str:
+    """Custom CSS for better styling (built once, then served from cache)."""
+    return """
 <style>
     .stChatMessage {
         padding: 1rem;
@@ -42,7 +48,94 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_data
+def header_html() -> str:
+    """Page header markup shared by every chat view."""
+    return """
+    <div class="main-header">
+        <h1>🎯 Intelligent HR Recruitment Platform</h1>
+        <p>Multi-Agent System powered by LangGraph</p>
+    </div>
+    """
+
+
+@st.cache_data
+def footer_html() -> str:
+    """Page footer markup."""
+    return (
+        "<div style='text-align: center; color: #888;'>"
+        "Built with ❤️ using LangGraph & Streamlit | "
+        "Hierarchical Supervisor Pattern"
+        "</div>"
+    )
+
+
+# Conversations kept in the checkpointer; the least recently active are dropped
+MAX_CHECKPOINT_THREADS = 200
+
+
+@st.cache_resource
+def get_checkpointer():
+    """
+    In-memory checkpointer shared by every session, bounded to MAX_CHECKPOINT_THREADS.
+    
+    Sessions never signal that they ended, so without a bound every
+    conversation's history and job_context would stay in memory for the
+    life of the process.
+    """
+    from langgraph.checkpoint.memory import MemorySaver
+    
+    class BoundedMemorySaver(MemorySaver):
+        """MemorySaver that keeps only the most recently written threads."""
+        
+        def __init__(self, max_threads: int):
+            super().__init__()
+            self.max_threads = max_threads
+            self._recent = OrderedDict()
+            self._recent_lock = threading.Lock()
+        
+        def put(self, config, checkpoint, metadata, new_versions):
+            result = super().put(config, checkpoint, metadata, new_versions)
+            thread_id = config["configurable"]["thread_id"]
+            with self._recent_lock:
+                self._recent[thread_id] = None
+                self._recent.move_to_end(thread_id)
+                evicted = []
+                while len(self._recent) > self.max_threads:
+                    evicted.append(self._recent.popitem(last=False)[0])
+            for old_thread_id in evicted:
+                self.delete_thread(old_thread_id)
+            return result
+        
+        def delete_thread(self, thread_id):
+            super().delete_thread(thread_id)
+            with self._recent_lock:
+                self._recent.pop(thread_id, None)
+    
+    return BoundedMemorySaver(MAX_CHECKPOINT_THREADS)
+
+
+@st.cache_resource
+def get_supervisor():
+    """Compile the supervisor graph once per process instead of on every rerun."""
+    from agents.supervisor import build_supervisor_graph
+    # Conversation state lives in the checkpointer, keyed by the session's thread_id
+    return build_supervisor_graph(checkpointer=get_checkpointer())
+
+
+@st.cache_resource
+def get_cv_parser():
+    """Import the CV parser (PyPDF2, python-docx, agent tooling) on first upload only."""
+    from agents.recruiter_agent.tools.parsers import cv_parser_tool
+    return cv_parser_tool
+
+
+def get_graph_config() -> dict:
+    """LangGraph config pointing at this session's checkpoint thread."""
+    return {"configurable": {"thread_id": st.session_state.thread_id}}
 
 
 def initialize_session_state():
@@ -52,6 +145,9 @@ def initialize_session_state():
     
     if "job_context" not in st.session_state:
         st.session_state.job_context = {}
+    
+    if "thread_id" not in st.session_state:
+        st.session_state.thread_id = uuid4().hex
 
 
 def render_sidebar():
@@ -100,6 +196,11 @@ def render_sidebar():
         if st.button("🗑️ Clear Conversation", use_container_width=True):
             st.session_state.messages = []
             st.session_state.job_context = {}
+            # Free the old conversation's checkpoints and stored CVs before starting a new thread
+            get_checkpointer().delete_thread(st.session_state.thread_id)
+            from agents.shared import delete_cv_texts
+            delete_cv_texts(st.session_state.thread_id)
+            st.session_state.thread_id = uuid4().hex
             if "pending_action" in st.session_state:
                 del st.session_state.pending_action
             st.rerun()
@@ -111,32 +212,64 @@ def render_sidebar():
         st.success("✅ Hiring Manager: Ready")
 
 
+def stream_response_tokens(input_state, result):
+    """
+    Yield the text deltas of a supervisor run.
+    
+    Args:
+        input_state: Graph input for this turn.
+        result: Dict filled with the final graph state (last "values" event).
+    """
+    current_id = None
+    for mode, payload in get_supervisor().stream(
+        input_state, config=get_graph_config(), stream_mode=["messages", "values"]
+    ):
+        if mode == "values":
+            result.update(payload)
+            continue
+        
+        chunk, _metadata = payload
+        # AIMessageChunk (LLM tokens) subclasses AIMessage (whole node outputs)
+        if not isinstance(chunk, AIMessage) or not chunk.content:
+            continue
+        # Separate consecutive messages (routing decision, agent answer)
+        if current_id is not None and chunk.id != current_id:
+            yield "\n\n"
+        current_id = chunk.id
+        yield chunk.content
+
+
 def process_graph_request(user_message):
     """Process a request through the supervisor graph (helper function)."""
     with st.chat_message("assistant"):
         with st.spinner("Processing..."):
             try:
-                # Prepare input state
+                # Prepare input state (history is restored from the checkpointer,
+                # so only the new message is sent)
                 input_state = {
                     "messages": [user_message],
                     "next": "",
                     "job_context": st.session_state.job_context
                 }
                 
-                # Stream/invoke the graph
-                result = supervisor_graph.invoke(input_state)
-                
-                # Extract and display responses
-                response_messages = result.get("messages", [])
+                # Stream the graph with st.write_stream, which coalesces the
+                # deltas into a single element and returns the full text
+                result = {}
+                buf = st.write_stream(stream_response_tokens(input_state, result))
                 
-                for msg in response_messages:
-                    if isinstance(msg, AIMessage):
-                        st.markdown(msg.content)
-                        st.session_state.messages.append(msg)
+                # Record the turn's response once, as a single message
+                if buf:
+                    st.session_state.messages.append(AIMessage(content=buf))
                 
-                # Update job context
-                if result.get("job_context"):
-                    st.session_state.job_context.update(result["job_context"])
+                # Update job context, writing only the keys whose values changed
+                job_context = st.session_state.job_context
+                changed = {
+                    key: value
+                    for key, value in (result.get("job_context") or {}).items()
+                    if job_context.get(key) != value
+                }
+                if changed:
+                    job_context.update(changed)
             
             except Exception as e:
                 error_msg = f"❌ Error processing request: {str(e)}"
@@ -144,24 +277,33 @@ def process_graph_request(user_message):
                 st.session_state.messages.append(AIMessage(content=error_msg))
 
 
+# Chat role per message class (exact type lookup instead of isinstance chains)
+CHAT_ROLES = {
+    HumanMessage: "user",
+    AIMessage: "assistant",
+}
+
+
+def render_messages(messages):
+    """Render conversation messages as chat bubbles, skipping non-chat messages."""
+    for message in messages:
+        role = CHAT_ROLES.get(type(message))
+        if role is not None:
+            with st.chat_message(role):
+                st.markdown(message.content)
+
+
 def render_chat_interface():
     """Render the main chat interface."""
     # Header
-    st.markdown("""
-    <div class="main-header">
-        <h1>🎯 Intelligent HR Recruitment Platform</h1>
-        <p>Multi-Agent System powered by LangGraph</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(header_html(), unsafe_allow_html=True)
     
     # Display chat messages
-    for message in st.session_state.messages:
-        if isinstance(message, HumanMessage):
-            with st.chat_message("user"):
-                st.markdown(message.content)
-        elif isinstance(message, AIMessage):
-            with st.chat_message("assistant"):
-                st.markdown(message.content)
+    render_messages(st.session_state.messages)
+    
+    # Answer a message queued by a previous run (e.g. a CV upload)
+    if st.session_state.pop("_auto_invoke", False):
+        process_graph_request(st.session_state.messages[-1])
     
     # Chat input
     if user_input := st.chat_input("Ask about candidates, job offers, or recruitment tasks..."):
@@ -177,8 +319,14 @@ def render_chat_interface():
         process_graph_request(user_message)
 
 
+@st.fragment
 def render_quick_actions():
-    """Render quick action buttons for common tasks."""
+    """
+    Render quick action buttons for common tasks.
+    
+    A fragment, so widget interactions here don't rerun the chat; a clicked
+    action still triggers a full rerun to show its message.
+    """
     st.markdown("### ⚡ Quick Actions")
     
     col1, col2, col3, col4 = st.columns(4)
@@ -204,26 +352,129 @@ def render_quick_actions():
             st.rerun()
 
 
+@st.cache_data(max_entries=64, show_spinner=False)
+def parse_cv(digest, filename, _data):
+    """
+    Parse a CV once per file content.
+    
+    Streamlit keys the cache on (digest, filename); the raw bytes are
+    underscore-prefixed so they are not hashed a second time.
+    """
+    file_obj = io.BytesIO(_data)
+    file_obj.name = filename  # The parser picks the format from the extension
+    return get_cv_parser().invoke({"file_obj": file_obj})
+
+
+def analyze_cv_batch(results):
+    """
+    Analyze several parsed CVs through one concurrent supervisor batch.
+    
+    Each CV gets its own graph run (outside the conversation's checkpoint
+    thread); prompts and answers are appended to the chat in upload order.
+    
+    The runs' results are written back to the session's job_context:
+    "candidates" lists one {cv_ref, meta, extracted_skills, summary} entry
+    per analyzed CV, replacing any earlier batch, and the last CV becomes
+    the current one (cv_ref, current_cv_meta, extracted_skills,
+    candidate_summary) so follow-ups such as "Rank Candidates" work.
+    """
+    from agents import run_supervisor_batch
+    from agents.shared import store_cv_text
+    
+    parsed = []
+    for result in results:
+        if result.get("error"):
+            st.session_state.messages.append(
+                AIMessage(content=f"❌ Error parsing CV {result['filename']}: {result['error']}")
+            )
+        else:
+            parsed.append(result)
+    
+    if not parsed:
+        return
+    
+    prompts = [f"I have uploaded a CV for analysis: {result['filename']}." for result in parsed]
+    contexts = [
+        {
+            "cv_ref": store_cv_text(result["text"], st.session_state.thread_id),
+            "current_cv_meta": {"filename": result["filename"], "pages": result["pages"]}
+        }
+        for result in parsed
+    ]
+    
+    with st.spinner(f"Analyzing {len(parsed)} CVs..."):
+        states = run_supervisor_batch(
+            prompts,
+            job_context=st.session_state.job_context,
+            max_concurrency=4,
+            job_contexts=contexts
+        )
+    
+    for prompt, state in zip(prompts, states):
+        st.session_state.messages.append(HumanMessage(content=prompt))
+        st.session_state.messages.append(AIMessage(content=state["messages"][-1].content))
+    
+    # Batch runs don't go through the checkpointed thread, so keep their
+    # results in the session's job_context for later requests
+    job_context = st.session_state.job_context
+    job_context.pop("current_cv_text", None)
+    job_context["candidates"] = [
+        {
+            "cv_ref": state["job_context"].get("cv_ref"),
+            "meta": state["job_context"].get("current_cv_meta"),
+            "extracted_skills": state["job_context"].get("extracted_skills"),
+            "summary": state["job_context"].get("candidate_summary")
+        }
+        for state in states
+    ]
+    last = states[-1]["job_context"]
+    for key in ("cv_ref", "current_cv_meta", "extracted_skills", "candidate_summary"):
+        if key in last:
+            job_context[key] = last[key]
+        else:
+            job_context.pop(key, None)
+
+
 def handle_cv_upload():
     """Handle CV upload and parsing."""
+    from agents.shared import store_cv_text
+    
     st.markdown("### 📄 Upload CV for Analysis")
-    uploaded_file = st.file_uploader("Choose a PDF or DOCX file", type=['pdf', 'docx'])
+    uploaded_files = st.file_uploader(
+        "Choose PDF or DOCX files", type=['pdf', 'docx'], accept_multiple_files=True
+    )
     
-    if uploaded_file is not None:
+    if uploaded_files:
         if st.button("Process CV", key="process_cv_btn"):
             with st.spinner("Parsing CV..."):
                 try:
-                    # Use the parser tool
-                    # Pass the uploaded_file directly
-                    result = cv_parser_tool.invoke({"file_obj": uploaded_file})
+                    # Use the parser tool (memoized on the file's content hash,
+                    # so re-processing the same file is a cache hit)
+                    results = []
+                    for uploaded_file in uploaded_files:
+                        data = uploaded_file.getvalue()
+                        digest = hashlib.sha256(data).hexdigest()
+                        results.append(parse_cv(digest, uploaded_file.name, data))
+                    
+                    # Several CVs: analyze them all in one concurrent batch
+                    if len(results) > 1:
+                        analyze_cv_batch(results)
+                        if "pending_action" in st.session_state:
+                            del st.session_state.pending_action
+                        st.rerun()
                     
+                    result = results[0]
                     if result.get("error"):
                         st.error(f"Error parsing CV: {result['error']}")
                     else:
                         st.success("CV parsed successfully!")
                         
-                        # Store in job context
-                        st.session_state.job_context["current_cv_text"] = result["text"]
+                        # Store in job context by reference: the text itself stays on
+                        # disk instead of being carried in session state every rerun
+                        st.session_state.job_context.pop("current_cv_text", None)
+                        st.session_state.job_context["cv_ref"] = store_cv_text(
+                            result["text"], st.session_state.thread_id
+                        )
                         st.session_state.job_context["current_cv_meta"] = {
                             "filename": result["filename"],
                             "pages": result["pages"]
@@ -241,9 +492,9 @@ def handle_cv_upload():
                         if "pending_action" in st.session_state:
                             del st.session_state.pending_action
                         
-                        # Trigger analysis automatically by invoking supervisor
-                        process_graph_request(user_msg)
-                                
+                        # Trigger analysis from the chat view on the next run, so the
+                        # response is painted once there instead of here and again after
+                        st.session_state._auto_invoke = True
                         st.rerun()
                         
                 except Exception as e:
@@ -260,12 +511,14 @@ def handle_cv_upload():
 
 def main():
     """Main application entry point."""
+    # Custom CSS for better styling
+    st.markdown(custom_css(), unsafe_allow_html=True)
+    
     # Initialize session state
     initialize_session_state()
     
     # Check for pending actions from quick action buttons
     # We handle this BEFORE rendering chat interface so the new message is visible
-    # But ideally we want to trigger processing too.
     
     if "pending_action" in st.session_state:
         action = st.session_state.pending_action
@@ -277,84 +530,13 @@ def main():
             return # Stop execution here for upload view
             
         elif isinstance(action, str):
-            # For other actions, just treat them as messages
+            # For other actions, treat them as messages: queue the message and
+            # fall through, so the normal flow renders and answers it
             del st.session_state.pending_action
-            user_message = HumanMessage(content=action)
-            st.session_state.messages.append(user_message)
-            # We DONT rerun immediately. We let the script flow down to render_chat_interface
-            # where the message will be displayed.
-            # AND we need to make sure the graph is invoked.
-            
-            # Since render_chat_interface logic is stuck inside "if user_input", 
-            # we need to trigger it manually here.
-            
-            # Render sidebar
-            render_sidebar()
-            
-            # Render chat interface (to show history + new message)
-            # But render_chat_interface only shows messages, and waits for input.
-            # We need to manually invoke processing for this action.
-            
-            # Header
-            st.markdown("""
-            <div class="main-header">
-                <h1>🎯 Intelligent HR Recruitment Platform</h1>
-                <p>Multi-Agent System powered by LangGraph</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Display chat messages (including the one we just added)
-            # Note: The logic in render_chat_interface loops state.messages,
-            # so we just need to replicate the input box and footer appearance
-            
-            # Actually, cleaner approach:
-            # 1. We process the message
-            # 2. We set a flag or just execute normal flow
-            
-            # Reusing render_chat_interface() but without waiting for input first?
-            # No, render_chat_interface does the loop. 
-            # We want to insert the processing.
+            st.session_state.messages.append(HumanMessage(content=action))
+            st.session_state._auto_invoke = True
 
-            # We don't import HumanMessage here as it is already imported in global scope
-            
-            # Render all previous messages including the new one
-            for message in st.session_state.messages:
-                if isinstance(message, HumanMessage):
-                    with st.chat_message("user"):
-                        st.markdown(message.content)
-                elif isinstance(message, AIMessage):
-                    with st.chat_message("assistant"):
-                        st.markdown(message.content)
-            
-            # NOW Trigger processing which will add the AI response
-            process_graph_request(user_message)
-            
-            # Show input for future messages
-            user_input = st.chat_input("Ask about candidates, job offers, or recruitment tasks...")
-            if user_input:
-                # This block handles input if the user types quickly after action, 
-                # but standard flow handles it on next rerun. 
-                # We can just ignore for this frame.
-                pass
-            
-            # Render quick actions
-            with st.container():
-                st.markdown("---")
-                render_quick_actions()
-                
-            # Footer
-            st.markdown("---")
-            st.markdown(
-                "<div style='text-align: center; color: #888;'>"
-                "Built with ❤️ using LangGraph & Streamlit | "
-                "Hierarchical Supervisor Pattern"
-                "</div>",
-                unsafe_allow_html=True
-            )
-            return # End execution here to avoid double rendering
-
-
-    # Normal Flow (No pending action)
+    # Normal Flow
     render_sidebar()
     render_chat_interface()
     
@@ -363,13 +545,7 @@ def main():
         render_quick_actions()
     
     st.markdown("---")
-    st.markdown(
-        "<div style='text-align: center; color: #888;'>"
-        "Built with ❤️ using LangGraph & Streamlit | "
-        "Hierarchical Supervisor Pattern"
-        "</div>",
-        unsafe_allow_html=True
-    )
+    st.markdown(footer_html(), unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
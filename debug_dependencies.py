@@ -1,5 +1,6 @@
 import sys
 import importlib
+import importlib.metadata
 
 packages = [
     "numpy",
@@ -11,9 +12,27 @@ packages = [
     "chromadb"
 ]
 
+# Installed distribution name, where it differs from the import name
+DISTRIBUTIONS = {
+    "sklearn": "scikit-learn",
+    "sentence_transformers": "sentence-transformers",
+}
+
+# --deep actually imports each package (slow: CUDA init, model registries, SQLite...)
+deep = "--deep" in sys.argv[1:]
+
 print(f"Python: {sys.version}")
 
 for package in packages:
+    if not deep:
+        # Read the version from the installed metadata without importing the package
+        try:
+            version = importlib.metadata.version(DISTRIBUTIONS.get(package, package))
+            print(f"✅ {package}: {version}")
+        except importlib.metadata.PackageNotFoundError as e:
+            print(f"❌ {package}: not installed ({e})")
+        continue
+
     try:
         module = importlib.import_module(package)
         version = getattr(module, "__version__", "unknown")
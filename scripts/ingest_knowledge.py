@@ -1,23 +1,80 @@
+import hashlib
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Paths
 KNOWLEDGE_DIR = "data/company_knowledge"
 CHROMA_DIR = "vectorstore/chroma"
 
+# {"embedder", "files": {path -> {"mtime", "sha", "id"}}} of the last ingest
+MANIFEST_PATH = os.path.join(CHROMA_DIR, "ingest_manifest.json")
+
+# Threads used to read knowledge files
+READ_WORKERS = 16
+
+# Documents per forward pass when encoding the corpus
+EMBED_BATCH_SIZE = 64
+
+# Documents per Chroma write
+UPSERT_BATCH_SIZE = 256
+
+# HNSW index parameters, applied when the collection is created (ingest()
+# rebuilds a collection created without them). The corpus
+# is built rarely and queried often: a denser graph (M, construction_ef) at
+# build time buys a lower search_ef at query time. Embeddings are normalized,
+# so cosine space matches the model. Keep in sync with
+# agents/manager_agent/tools/retrieval.py.
+HNSW_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 32
+}
+
 def get_embedding_model():
     """Returns real embeddings if available, else fake/random ones."""
     try:
         import transformers
         from langchain_huggingface import HuggingFaceEmbeddings
         return HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
+            model_name="sentence-transformers/all-MiniLM-L6-v2",
+            encode_kwargs={"batch_size": EMBED_BATCH_SIZE, "normalize_embeddings": True},
+            show_progress=True
         )
     except Exception as e:
         print(f"Warning: Error loading HF Embeddings (fallback to Fake): {e}")
         from langchain_core.embeddings import FakeEmbeddings
         return FakeEmbeddings(size=384)
 
+def embedder_name(embedding_model):
+    """Identifies the embeddings vectors were written with ("fake" for the fallback)."""
+    from langchain_core.embeddings import FakeEmbeddings
+    if isinstance(embedding_model, FakeEmbeddings):
+        return "fake"
+    return getattr(embedding_model, "model_name", type(embedding_model).__name__)
+
+def document_id(file_path, sha):
+    """Chroma id of a file's document: unique per path, changes with the content."""
+    return hashlib.sha256(f"{file_path}\0{sha}".encode("utf-8")).hexdigest()
+
+def load_manifest():
+    """Returns the ingest manifest from the last run (empty if missing, unreadable or outdated)."""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), dict):
+        return {"embedder": None, "files": {}}
+    return manifest
+
+def save_manifest(manifest):
+    os.makedirs(CHROMA_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
 def ingest():
     # Lazy imports to avoid top-level crashes in broken envs
     # removing TextLoader import as it's broken
@@ -25,20 +82,55 @@ def ingest():
     from langchain_core.documents import Document
     
     # Simple manual loader to bypass broken langchain_community loaders
-    class SimpleTextLoader:
-        def __init__(self, file_path, encoding="utf-8"):
-            self.file_path = file_path
-            self.encoding = encoding
-            
-        def load(self):
-            with open(self.file_path, "r", encoding=self.encoding) as f:
-                text = f.read()
-            return [Document(page_content=text, metadata={"source": self.file_path})]
-
-    # Embedding model (robust load)
-    embedding_model = get_embedding_model()
+    def load_document(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return Document(
+            page_content=text,
+            metadata={
+                "source": os.path.basename(file_path),
+                # Folder name = category (metadata)
+                "category": os.path.basename(os.path.dirname(file_path)),
+                "sha": hashlib.sha256(text.encode("utf-8")).hexdigest()
+            }
+        )
 
     documents = []
+    ids = []
+    manifest = load_manifest()
+    stale_ids = []
+    embedding_model = None
+
+    vectordb = Chroma(
+        persist_directory=CHROMA_DIR,
+        embedding_function=None,
+        collection_metadata=HNSW_METADATA
+    )
+
+    # The manifest must describe the collection exactly. If it doesn't (first
+    # run against a store built before incremental ingest, with uuid ids, or
+    # a lost manifest), the collection predates the HNSW tuning (Chroma only
+    # applies index parameters at creation), or the stored vectors came from
+    # the fake fallback and real embeddings are now available, rebuild from scratch.
+    stored_ids = set(vectordb._collection.get(include=[])["ids"])
+    tracked_ids = {entry["id"] for entry in manifest["files"].values()}
+    index_metadata = vectordb._collection.metadata or {}
+    rebuild = stored_ids != tracked_ids or not HNSW_METADATA.items() <= index_metadata.items()
+    if not rebuild and manifest["embedder"] == "fake":
+        embedding_model = get_embedding_model()
+        rebuild = embedder_name(embedding_model) != "fake"
+
+    if rebuild:
+        print("Rebuilding the knowledge collection from scratch.")
+        vectordb.delete_collection()
+        vectordb = Chroma(
+            persist_directory=CHROMA_DIR,
+            embedding_function=None,
+            collection_metadata=HNSW_METADATA
+        )
+        manifest = {"embedder": None, "files": {}}
+    collection = vectordb._collection
+    files = manifest["files"]
     
     if not os.path.exists(KNOWLEDGE_DIR):
         print(f"Directory {KNOWLEDGE_DIR} not found. Creating it.")
@@ -48,37 +140,84 @@ def ingest():
             f.write("Role: General\nSample offer template content here.")
 
     # Walk through all subfolders
-    for root, _, files in os.walk(KNOWLEDGE_DIR):
-        for file in files:
-            if file.endswith(".txt"):
-                file_path = os.path.join(root, file)
-
-                # Folder name = category (metadata)
-                category = os.path.basename(root)
-
-                loader = SimpleTextLoader(file_path, encoding="utf-8")
-                docs = loader.load()
-
-                for doc in docs:
-                    doc.metadata = {
-                        "source": file,
-                        "category": category
-                    }
-
-                documents.extend(docs)
-
-    print(f"Loaded {len(documents)} documents")
-
-    if not documents:
+    paths = [
+        os.path.join(root, file)
+        for root, _, files_in_dir in os.walk(KNOWLEDGE_DIR)
+        for file in files_in_dir
+        if file.endswith(".txt")
+    ]
+    seen_paths = set(paths)
+
+    # Unchanged mtime: skip without even opening the file
+    mtimes = {path: os.stat(path).st_mtime for path in paths}
+    changed = [
+        path for path in paths
+        if files.get(path, {}).get("mtime") != mtimes[path]
+    ]
+
+    # Reads are I/O-bound, so overlap them across threads
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        loaded = list(executor.map(load_document, changed))
+
+    for file_path, doc in zip(changed, loaded):
+        mtime = mtimes[file_path]
+        sha = doc.metadata["sha"]
+        entry = files.get(file_path)
+
+        # Touched but identical content: only refresh the mtime
+        if entry and entry["sha"] == sha:
+            entry["mtime"] = mtime
+            continue
+        if entry:
+            stale_ids.append(entry["id"])
+        doc_id = document_id(file_path, sha)
+        files[file_path] = {"mtime": mtime, "sha": sha, "id": doc_id}
+        documents.append(doc)
+        ids.append(doc_id)
+
+    # Forget files that were deleted since the last run
+    removed = [path for path in files if path not in seen_paths]
+    stale_ids.extend(files.pop(path)["id"] for path in removed)
+
+    print(f"Loaded {len(documents)} new or changed documents")
+
+    # Drop the vectors of changed or deleted files
+    if stale_ids:
+        collection.delete(ids=stale_ids)
+
+    if not documents and not stale_ids:
+        save_manifest(manifest)
         print("No documents to ingest.")
         return
 
-    # Create or update ChromaDB
-    vectordb = Chroma.from_documents(
-        documents=documents,
-        embedding=embedding_model,
-        persist_directory=CHROMA_DIR
-    )
+    if documents:
+        # Embedding model (robust load), only when there is something to encode
+        if embedding_model is None:
+            embedding_model = get_embedding_model()
+
+        texts = [doc.page_content for doc in documents]
+        metadatas = [doc.metadata for doc in documents]
+
+        # Encode everything in one call; the model's encode_kwargs set the
+        # batch size and normalization
+        embeddings = embedding_model.embed_documents(texts)
+
+        # Upsert the precomputed vectors keyed by path + content hash, so
+        # re-runs never duplicate a document
+        for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+            end = start + UPSERT_BATCH_SIZE
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end]
+            )
+
+        # Remember fallback vectors so they get re-embedded once the real model loads
+        name = embedder_name(embedding_model)
+        manifest["embedder"] = "fake" if "fake" in (manifest["embedder"], name) else name
+
+    save_manifest(manifest)
 
     # vectordb.persist() # Chroma 0.4+ persists automatically or uses different method
 
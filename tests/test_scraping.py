@@ -0,0 +1,66 @@
+"""
+Parity tests for the job-page HTML extraction.
+
+The selectolax (Lexbor) fast path must produce exactly the Markdown the
+BeautifulSoup path produces.
+"""
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("selectolax.lexbor")
+
+from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+
+from agents.recruiter_agent.tools.scraping import (
+    _extract_text_blocks,
+    _extract_text_blocks_fast,
+)
+
+
+NESTED_DIV_PAGE = """
+<html><head><title>Backend Engineer</title><script>var tracking = 1;</script></head>
+<body>
+  <div>
+    <div>
+      <p>
+        First paragraph of the posting.
+      </p>
+      <p>Second <b>bold</b> paragraph with <a href="#">a link</a> inside.</p>
+    </div>
+  </div>
+  <h2>  Requirements  </h2>
+  <ul>
+    <li>Five years of Python experience</li>
+    <li>  Docker and <span>Kubernetes know-how</span> </li>
+  </ul>
+  <nav>Navigation text that must be skipped</nav>
+  <!-- a comment that is long enough to count -->
+  <footer>Footer text that must be skipped</footer>
+</body></html>
+"""
+
+HEADINGS_PAGE = """
+<html><body>
+<h1>Senior Data Scientist</h1>
+<h3>About the role</h3>
+<p>You will build   models
+   for our recruitment platform.</p>
+<p>Short</p>
+<div><span>Remote friendly, Paris office</span></div>
+<style>.hidden { display: none; }</style>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("html", [NESTED_DIV_PAGE, HEADINGS_PAGE, "", "<p>tiny</p>"])
+def test_fast_extraction_matches_beautifulsoup(html):
+    expected = _extract_text_blocks(BeautifulSoup(html, "html.parser"))
+    assert _extract_text_blocks_fast(LexborHTMLParser(html)) == expected
+
+
+def test_whitespace_nodes_do_not_duplicate_paragraphs():
+    markdown = _extract_text_blocks_fast(LexborHTMLParser(NESTED_DIV_PAGE))
+    assert markdown.count("\n\nFirst paragraph of the posting.\n\n") == 1
+    assert "  " not in markdown